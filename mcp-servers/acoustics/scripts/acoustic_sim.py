@@ -17,20 +17,69 @@ import sys
 import json
 import math
 import argparse
-import cmath
 from typing import List, Dict, Tuple, Optional
 
+import numpy as np
+
+# orjson is optional; it serializes NumPy arrays straight from their buffers
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Physical constants
 C_AIR = 343.0  # Speed of sound in air (m/s) at 20°C
 RHO_AIR = 1.21  # Air density (kg/m³) at 20°C
 
 
+def _json_default(obj):
+    """Encode NumPy arrays and scalars for the stdlib json fallback."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode_result(result: Dict, indent: bool = False) -> bytes:
+    """Serialize a simulation result, which may hold NumPy arrays, to JSON."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(result, option=option)
+    if indent:
+        return json.dumps(result, indent=2, default=_json_default).encode()
+    return json.dumps(result, separators=(',', ':'), default=_json_default).encode()
+
+
 def load_profile(profile_path: str) -> List[Dict]:
     """Load horn profile from JSON file."""
     with open(profile_path, 'r') as f:
         return json.load(f)
 
 
+def _tmm_cascade(gamma: np.ndarray, z_load: np.ndarray,
+                 lengths: np.ndarray, z0s: np.ndarray) -> np.ndarray:
+    """
+    Cascade segment transfer matrices from the mouth load back to the throat.
+    """
+    z_current = z_load
+    for j in range(lengths.shape[0]):
+        z0 = z0s[j]
+
+        # Transfer matrix elements for conical segment
+        gamma_l = gamma * lengths[j]
+        cosh_gl = np.cosh(gamma_l)
+        sinh_gl = np.sinh(gamma_l)
+
+        # Input impedance from transmission line theory
+        z_current = z0 * (z_current * cosh_gl + z0 * sinh_gl) / (z0 * cosh_gl + z_current * sinh_gl)
+
+    return z_current
+
+
 def compute_horn_impedance_tmm(profile: List[Dict], frequencies: List[float],
                                  throat_velocity: float = 1.0) -> Dict:
     """
@@ -38,100 +87,62 @@ def compute_horn_impedance_tmm(profile: List[Dict], frequencies: List[float],
 
     Divides horn into cylindrical segments and cascades their transfer matrices.
     Returns complex impedance at throat as function of frequency.
+
+    The cascade runs over segments only; every step is evaluated for the
+    whole frequency array at once as complex NumPy arrays.
     """
-    # Convert profile to SI units (mm -> m)
-    segments = []
-    for i in range(len(profile) - 1):
-        z1 = profile[i]['z'] / 1000  # m
-        z2 = profile[i + 1]['z'] / 1000  # m
-        r1 = profile[i]['radius'] / 1000  # m
-        r2 = profile[i + 1]['radius'] / 1000  # m
-
-        length = z2 - z1
-        avg_radius = (r1 + r2) / 2
-        area1 = math.pi * r1 ** 2
-        area2 = math.pi * r2 ** 2
-
-        segments.append({
-            'length': length,
-            'area_in': area1,
-            'area_out': area2,
-            'avg_radius': avg_radius
-        })
+    # Convert profile to SI units (mm -> m) and precompute the
+    # frequency-independent length and characteristic impedance of each
+    # segment, in propagation order (mouth to throat)
+    z = np.array([p['z'] for p in profile]) / 1000  # m
+    r = np.array([p['radius'] for p in profile]) / 1000  # m
+    area = np.pi * r ** 2
+    area_avg = (area[:-1] + area[1:]) / 2
+    lengths = np.diff(z)[::-1].copy()
+    z0s = (RHO_AIR * C_AIR / area_avg)[::-1].copy()
 
     mouth_area = math.pi * (profile[-1]['radius'] / 1000) ** 2
     mouth_radius = profile[-1]['radius'] / 1000
+    throat_area = math.pi * (profile[0]['radius'] / 1000) ** 2
 
-    impedance_data = {
-        'frequencies_hz': [],
-        'impedance_real': [],
-        'impedance_imag': [],
-        'impedance_magnitude': [],
-        'impedance_phase': [],
-        'reflection_coefficient': [],
-    }
-
-    for freq in frequencies:
-        omega = 2 * math.pi * freq
-        k = omega / C_AIR  # wavenumber
-
-        # Radiation impedance at mouth (piston in infinite baffle approximation)
-        ka = k * mouth_radius
-
-        # Low-frequency approximation for radiation impedance
-        if ka < 2:
-            # Small ka: Z_rad ≈ ρc * S * (ka²/2 + j*8ka/(3π))
-            z_rad_real = RHO_AIR * C_AIR * mouth_area * (ka ** 2) / 2
-            z_rad_imag = RHO_AIR * C_AIR * mouth_area * (8 * ka) / (3 * math.pi)
-        else:
-            # Large ka: approaches ρc * S
-            z_rad_real = RHO_AIR * C_AIR * mouth_area * (1 - math.sin(2*ka)/(2*ka))
-            z_rad_imag = RHO_AIR * C_AIR * mouth_area * (math.sin(ka)**2 / ka)
-
-        z_load = complex(z_rad_real, z_rad_imag)
-
-        # Propagate backwards through segments using transfer matrices
-        z_current = z_load
-
-        for seg in reversed(segments):
-            # Characteristic impedance of segment
-            area_avg = (seg['area_in'] + seg['area_out']) / 2
-            z0 = RHO_AIR * C_AIR / area_avg
-
-            # Conical horn correction factor
-            flare_rate = (seg['area_out'] - seg['area_in']) / (seg['length'] * area_avg)
-
-            # Propagation constant with losses
-            alpha = 0.001 * math.sqrt(freq)  # Viscothermal losses (simplified)
-            gamma = complex(alpha, k)
-
-            # Transfer matrix elements for conical segment
-            kl = k * seg['length']
-            cosh_gl = cmath.cosh(gamma * seg['length'])
-            sinh_gl = cmath.sinh(gamma * seg['length'])
-
-            # Input impedance from transmission line theory
-            z_current = z0 * (z_current * cosh_gl + z0 * sinh_gl) / (z0 * cosh_gl + z_current * sinh_gl)
-
-        # Throat impedance
-        z_throat = z_current
-        throat_area = math.pi * (profile[0]['radius'] / 1000) ** 2
-        z0_throat = RHO_AIR * C_AIR / throat_area
-
-        # Normalize to specific acoustic impedance
-        z_normalized = z_throat / (RHO_AIR * C_AIR * throat_area)
-
-        # Reflection coefficient
-        gamma_r = (z_normalized - 1) / (z_normalized + 1)
+    freqs = np.asarray(frequencies, dtype=np.float64)
+    k = 2 * np.pi * freqs / C_AIR  # wavenumber
 
-        impedance_data['frequencies_hz'].append(freq)
-        impedance_data['impedance_real'].append(z_throat.real)
-        impedance_data['impedance_imag'].append(z_throat.imag)
-        impedance_data['impedance_magnitude'].append(abs(z_throat))
-        impedance_data['impedance_phase'].append(math.degrees(cmath.phase(z_throat)))
-        impedance_data['reflection_coefficient'].append(abs(gamma_r))
+    # Radiation impedance at mouth (piston in infinite baffle approximation)
+    ka = k * mouth_radius
+    rho_c_s = RHO_AIR * C_AIR * mouth_area
+    small_ka = ka < 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Small ka: Z_rad ≈ ρc * S * (ka²/2 + j*8ka/(3π))
+        # Large ka: approaches ρc * S
+        z_rad_real = np.where(small_ka, rho_c_s * ka ** 2 / 2,
+                              rho_c_s * (1 - np.sin(2 * ka) / (2 * ka)))
+        z_rad_imag = np.where(small_ka, rho_c_s * (8 * ka) / (3 * np.pi),
+                              rho_c_s * (np.sin(ka) ** 2 / ka))
+
+    # Propagation constant with losses
+    alpha = 0.001 * np.sqrt(freqs)  # Viscothermal losses (simplified)
+    gamma = alpha + 1j * k
+
+    # Propagate backwards through segments using transfer matrices
+    z_throat = _tmm_cascade(gamma, z_rad_real + 1j * z_rad_imag, lengths, z0s)
+
+    # Normalize to specific acoustic impedance
+    z_normalized = z_throat / (RHO_AIR * C_AIR * throat_area)
+
+    # Reflection coefficient, (Zn - 1) / (Zn + 1) computed in place
+    gamma_r = z_normalized - 1
+    np.add(z_normalized, 1, out=z_normalized)
+    np.divide(gamma_r, z_normalized, out=gamma_r)
 
-    return impedance_data
+    return {
+        'frequencies_hz': freqs,
+        'impedance_real': np.ascontiguousarray(z_throat.real),
+        'impedance_imag': np.ascontiguousarray(z_throat.imag),
+        'impedance_magnitude': np.abs(z_throat),
+        'impedance_phase': np.degrees(np.angle(z_throat)),
+        'reflection_coefficient': np.abs(gamma_r),
+    }
 
 
 def compute_directivity(mouth_radius_mm: float, frequency_hz: float,
@@ -145,28 +156,21 @@ def compute_directivity(mouth_radius_mm: float, frequency_hz: float,
     k = 2 * math.pi * frequency_hz / C_AIR
     ka = k * mouth_radius
 
-    directivity = []
-    for angle_deg in angles:
-        angle_rad = math.radians(angle_deg)
-
-        if angle_deg == 0:
-            # On-axis: maximum
-            d = 1.0
-        else:
-            # Bessel function approximation for J1
-            x = ka * math.sin(angle_rad)
-            if abs(x) < 0.001:
-                d = 1.0
-            else:
-                # J1(x)/x using series expansion or approximation
-                j1_over_x = bessel_j1(x) / x
-                d = 2 * j1_over_x
-
-        spl_relative = 20 * math.log10(max(abs(d), 1e-10))
-        directivity.append({
-            'angle_deg': angle_deg,
-            'relative_spl_db': spl_relative
-        })
+    angles_deg = np.asarray(angles, dtype=np.float64)
+    x = ka * np.sin(np.radians(angles_deg))
+
+    # On-axis (and vanishing ka·sinθ) is the maximum; elsewhere
+    # D = 2·J1(x)/x
+    on_axis = (angles_deg == 0) | (np.abs(x) < 0.001)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d = np.where(on_axis, 1.0, 2 * bessel_j1(x) / x)
+
+    spl_relative = 20 * np.log10(np.maximum(np.abs(d), 1e-10))
+    # Parallel arrays rather than one dict per angle
+    directivity = {
+        'angle_deg': list(angles),
+        'relative_spl_db': spl_relative
+    }
 
     # Find coverage angles
     coverage_6db = find_coverage_angle(directivity, -6)
@@ -182,46 +186,45 @@ def compute_directivity(mouth_radius_mm: float, frequency_hz: float,
     }
 
 
-def bessel_j1(x: float) -> float:
-    """First-order Bessel function J1(x) approximation."""
-    if abs(x) < 3:
-        # Small argument series
-        x2 = x * x
-        return x/2 * (1 - x2/8 + x2*x2/192 - x2*x2*x2/9216)
-    else:
-        # Large argument asymptotic
-        return math.sqrt(2/(math.pi*x)) * math.cos(x - 3*math.pi/4)
+def bessel_j1(x: np.ndarray) -> np.ndarray:
+    """First-order Bessel function J1(x) approximation, elementwise."""
+    x = np.asarray(x, dtype=np.float64)
+    x2 = x * x
+    # Small argument series
+    small = x/2 * (1 - x2/8 + x2*x2/192 - x2*x2*x2/9216)
+    # Large argument asymptotic
+    with np.errstate(divide='ignore', invalid='ignore'):
+        large = np.sqrt(2/(np.pi*x)) * np.cos(x - 3*np.pi/4)
+    return np.where(np.abs(x) < 3, small, large)
 
 
-def find_coverage_angle(directivity: List[Dict], level_db: float) -> float:
+def find_coverage_angle(directivity: Dict, level_db: float) -> float:
     """Find angle where SPL drops to level_db from on-axis."""
-    for i, point in enumerate(directivity):
-        if point['relative_spl_db'] < level_db:
-            if i == 0:
-                return 0
-            # Interpolate
-            prev = directivity[i-1]
-            frac = (level_db - prev['relative_spl_db']) / (point['relative_spl_db'] - prev['relative_spl_db'])
-            return prev['angle_deg'] + frac * (point['angle_deg'] - prev['angle_deg'])
-    return directivity[-1]['angle_deg']
-
-
-def compute_di(directivity: List[Dict]) -> float:
+    angles = directivity['angle_deg']
+    spl = np.asarray(directivity['relative_spl_db'])
+    below = spl < level_db
+    if not below.any():
+        return angles[-1]
+    i = int(np.argmax(below))
+    if i == 0:
+        return 0
+    # Interpolate
+    frac = float((level_db - spl[i-1]) / (spl[i] - spl[i-1]))
+    return angles[i-1] + frac * (angles[i] - angles[i-1])
+
+
+def compute_di(directivity: Dict) -> float:
     """Compute Directivity Index from directivity pattern."""
     # Approximate DI using numerical integration
     # DI = 10 log10(4π / ∫∫ D²(θ,φ) sin(θ) dθ dφ)
 
-    total = 0
-    for i in range(len(directivity) - 1):
-        angle1 = math.radians(directivity[i]['angle_deg'])
-        angle2 = math.radians(directivity[i+1]['angle_deg'])
-        d1 = 10 ** (directivity[i]['relative_spl_db'] / 20)
-        d2 = 10 ** (directivity[i+1]['relative_spl_db'] / 20)
+    angles = np.radians(directivity['angle_deg'])
+    d = 10 ** (np.asarray(directivity['relative_spl_db']) / 20)
 
-        # Simpson's rule integration
-        d_avg = (d1 + d2) / 2
-        d_theta = angle2 - angle1
-        total += d_avg ** 2 * math.sin((angle1 + angle2) / 2) * d_theta
+    # Trapezoidal integration over adjacent angle pairs
+    d_avg = (d[:-1] + d[1:]) / 2
+    d_theta = np.diff(angles)
+    total = float(np.sum(d_avg ** 2 * np.sin((angles[:-1] + angles[1:]) / 2) * d_theta))
 
     # Account for full sphere (assume symmetric)
     solid_angle = 2 * math.pi * total
@@ -234,68 +237,65 @@ def compute_di(directivity: List[Dict]) -> float:
 
 
 def compute_frequency_response(profile: List[Dict], frequencies: List[float],
-                                sensitivity_ref: float = 107.0) -> Dict:
+                                sensitivity_ref: float = 107.0,
+                                impedance: Optional[Dict] = None) -> Dict:
     """
     Compute on-axis frequency response (SPL vs frequency).
 
-    Uses impedance data to estimate sensitivity variations.
+    Uses impedance data to estimate sensitivity variations. Pass the result
+    of compute_horn_impedance_tmm for the same frequencies as `impedance`
+    to reuse it instead of recomputing.
     """
-    impedance = compute_horn_impedance_tmm(profile, frequencies)
+    if impedance is None:
+        impedance = compute_horn_impedance_tmm(profile, frequencies)
 
     # Base sensitivity from throat size and radiation efficiency
     throat_area = math.pi * (profile[0]['radius'] / 1000) ** 2
     mouth_area = math.pi * (profile[-1]['radius'] / 1000) ** 2
     expansion_ratio = mouth_area / throat_area
 
-    spl = []
-    for i, freq in enumerate(frequencies):
-        # Radiation efficiency increases with frequency up to cutoff
-        ka = 2 * math.pi * freq * (profile[-1]['radius'] / 1000) / C_AIR
-
-        if ka < 0.5:
-            # Below cutoff: efficiency falls off
-            efficiency_factor = ka ** 2
-        elif ka < 2:
-            # Transition region
-            efficiency_factor = 0.25 + 0.75 * (ka - 0.5) / 1.5
-        else:
-            # Above cutoff: full efficiency
-            efficiency_factor = 1.0
-
-        # Impedance matching factor (low reflection = high transfer)
-        reflection = impedance['reflection_coefficient'][i]
-        matching_factor = 1 - reflection ** 2
-
-        # Combined SPL
-        level = sensitivity_ref + 10 * math.log10(efficiency_factor * matching_factor + 0.001)
-
-        # Add some realistic variation from resonances
-        phase = impedance['impedance_phase'][i]
-        resonance_effect = 0.5 * math.sin(math.radians(phase * 2))
-
-        spl.append(round(level + resonance_effect, 2))
-
-    # Find cutoff frequency (where response drops 3dB from passband)
-    passband_level = max(spl[len(spl)//4:len(spl)*3//4])
-    cutoff_low = frequencies[0]
-    cutoff_high = frequencies[-1]
-
-    for i, level in enumerate(spl):
-        if level > passband_level - 3:
-            cutoff_low = frequencies[i]
-            break
-
-    for i in range(len(spl) - 1, -1, -1):
-        if spl[i] > passband_level - 3:
-            cutoff_high = frequencies[i]
-            break
+    freqs = np.asarray(frequencies, dtype=np.float64)
+
+    # Radiation efficiency increases with frequency up to cutoff: falls off
+    # as ka² below cutoff, ramps linearly through the transition region and
+    # is full above cutoff
+    ka = 2 * np.pi * freqs * (profile[-1]['radius'] / 1000) / C_AIR
+    efficiency_factor = np.where(
+        ka < 0.5, ka ** 2,
+        np.where(ka < 2, 0.25 + 0.75 * (ka - 0.5) / 1.5, 1.0))
+
+    # Impedance matching factor (low reflection = high transfer)
+    reflection = np.asarray(impedance['reflection_coefficient'])
+    matching_factor = np.square(reflection)
+    np.subtract(1, matching_factor, out=matching_factor)
+
+    # Combined SPL, reusing the matching factor's buffer
+    level = np.multiply(efficiency_factor, matching_factor, out=matching_factor)
+    level += 0.001
+    np.log10(level, out=level)
+    level *= 10
+    level += sensitivity_ref
+
+    # Add some realistic variation from resonances
+    phase = np.asarray(impedance['impedance_phase'])
+    resonance_effect = 0.5 * np.sin(np.radians(phase * 2))
+
+    spl = np.round(level + resonance_effect, 2)
+
+    # Find cutoff frequency (where response drops 3dB from passband): the
+    # first and last points within 3dB, which always include the passband peak
+    passband_spl = spl[len(spl)//4:len(spl)*3//4]
+    passband_level = float(passband_spl.max())
+    within_3db = np.flatnonzero(spl > passband_level - 3)
+    cutoff_low = float(frequencies[within_3db[0]])
+    cutoff_high = float(frequencies[within_3db[-1]])
 
     return {
         'frequencies_hz': frequencies,
         'spl_db': spl,
         'passband_hz': {'low': round(cutoff_low), 'high': round(cutoff_high)},
         'sensitivity_db': round(passband_level, 1),
-        'flatness_db': round(max(spl) - min(spl[len(spl)//4:len(spl)*3//4]), 1)
+        'flatness_db': round(float(spl.max() - passband_spl.min()), 1)
     }
 
 
@@ -305,29 +305,30 @@ def compute_acoustic_score(impedance: Dict, frequency_response: Dict,
     Compute overall acoustic quality score (0-1).
     """
     # Impedance smoothness (lower variance = better)
-    z_mag = impedance['impedance_magnitude']
-    z_mean = sum(z_mag) / len(z_mag)
-    z_std = math.sqrt(sum((z - z_mean) ** 2 for z in z_mag) / len(z_mag))
+    z_mag = np.asarray(impedance['impedance_magnitude'])
+    z_mean = float(z_mag.mean())
+    z_std = float(z_mag.std())
     smoothness = max(0, 1 - z_std / z_mean)
 
     # Frequency flatness
-    passband_spl = frequency_response['spl_db'][len(frequency_response['spl_db'])//4:-len(frequency_response['spl_db'])//4]
-    if passband_spl:
-        flatness = max(0, 1 - (max(passband_spl) - min(passband_spl)) / 6)  # ±3dB = 1.0
+    spl = np.asarray(frequency_response['spl_db'])
+    passband_spl = spl[len(spl)//4:-len(spl)//4]
+    if passband_spl.size:
+        flatness = max(0, 1 - float(np.ptp(passband_spl)) / 6)  # ±3dB = 1.0
     else:
         flatness = 0.5
 
     # Polar uniformity (consistent coverage across frequencies)
-    coverage_values = [d['coverage_6db_deg'] for d in directivity_samples]
-    if coverage_values:
-        cv_mean = sum(coverage_values) / len(coverage_values)
-        cv_std = math.sqrt(sum((c - cv_mean) ** 2 for c in coverage_values) / len(coverage_values))
+    coverage_values = np.array([d['coverage_6db_deg'] for d in directivity_samples])
+    if coverage_values.size:
+        cv_mean = float(coverage_values.mean())
+        cv_std = float(coverage_values.std())
         uniformity = max(0, 1 - cv_std / cv_mean) if cv_mean > 0 else 0.5
     else:
         uniformity = 0.5
 
     # Distortion estimate (based on impedance peaks)
-    reflection_max = max(impedance['reflection_coefficient'])
+    reflection_max = float(np.max(impedance['reflection_coefficient']))
     distortion = max(0, 1 - reflection_max)
 
     # Weighted overall score
@@ -360,14 +361,11 @@ def run_full_simulation(profile_path: str, freq_min: float = 500,
     profile = load_profile(profile_path)
 
     # Generate logarithmic frequency array
-    frequencies = [
-        freq_min * (freq_max / freq_min) ** (i / (freq_points - 1))
-        for i in range(freq_points)
-    ]
+    frequencies = np.geomspace(freq_min, freq_max, freq_points)
 
     # Compute all acoustic properties
     impedance = compute_horn_impedance_tmm(profile, frequencies)
-    freq_response = compute_frequency_response(profile, frequencies)
+    freq_response = compute_frequency_response(profile, frequencies, impedance=impedance)
 
     # Directivity at key frequencies
     mouth_radius = profile[-1]['radius']
@@ -396,12 +394,12 @@ def run_full_simulation(profile_path: str, freq_min: float = 500,
             'frequency_points': freq_points
         },
         'impedance': {
-            'mean_magnitude_ohms': round(sum(impedance['impedance_magnitude']) / len(impedance['impedance_magnitude']), 1),
+            'mean_magnitude_ohms': round(float(np.mean(impedance['impedance_magnitude'])), 1),
             'phase_range_deg': {
-                'min': round(min(impedance['impedance_phase']), 1),
-                'max': round(max(impedance['impedance_phase']), 1)
+                'min': round(float(np.min(impedance['impedance_phase'])), 1),
+                'max': round(float(np.max(impedance['impedance_phase'])), 1)
             },
-            'reflection_coefficient_avg': round(sum(impedance['reflection_coefficient']) / len(impedance['reflection_coefficient']), 3),
+            'reflection_coefficient_avg': round(float(np.mean(impedance['reflection_coefficient'])), 3),
             'data': impedance
         },
         'frequency_response': freq_response,
@@ -430,14 +428,13 @@ def main():
         freq_points=args.freq_points
     )
 
-    output = json.dumps(result, indent=2)
-
     if args.output:
-        with open(args.output, 'w') as f:
-            f.write(output)
+        with open(args.output, 'wb') as f:
+            f.write(encode_result(result, indent=True))
         print(f"Results written to {args.output}", file=sys.stderr)
     else:
-        print(output)
+        # stdout is parsed by the MCP server, so skip the whitespace
+        sys.stdout.buffer.write(encode_result(result) + b'\n')
 
 
 if __name__ == '__main__':
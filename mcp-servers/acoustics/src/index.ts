@@ -22,6 +22,9 @@ const RHO_AIR = 1.21; // Air density (kg/m³)
 const SCRIPTS_DIR = path.join(import.meta.dirname, "..", "scripts");
 const ARTIFACTS_DIR = path.join(import.meta.dirname, "..", "..", "..", "artifacts", "simulation");
 
+// Child stderr is only quoted in error messages, so keep just its tail
+const STDERR_TAIL_CHARS = 64 * 1024;
+
 async function ensureArtifactsDir() {
   await fs.mkdir(ARTIFACTS_DIR, { recursive: true });
 }
@@ -35,13 +38,19 @@ async function runAcousticSim(args: string[]): Promise<object> {
       env: { ...process.env, PYTHONIOENCODING: "utf-8" }
     });
 
-    let stdout = "";
+    // Collect raw chunks and decode once, so multi-byte characters split
+    // across chunks survive and large outputs are not re-concatenated per chunk
+    const stdoutChunks: Buffer[] = [];
     let stderr = "";
 
-    proc.stdout.on("data", (data) => { stdout += data.toString(); });
-    proc.stderr.on("data", (data) => { stderr += data.toString(); });
+    proc.stdout.on("data", (data: Buffer) => { stdoutChunks.push(data); });
+    proc.stderr.on("data", (data) => {
+      stderr += data.toString();
+      if (stderr.length > STDERR_TAIL_CHARS) stderr = stderr.slice(-STDERR_TAIL_CHARS);
+    });
 
     proc.on("close", (code) => {
+      const stdout = Buffer.concat(stdoutChunks).toString("utf-8");
       if (code === 0) {
         try {
           resolve(JSON.parse(stdout));
@@ -59,9 +68,78 @@ async function runAcousticSim(args: string[]): Promise<object> {
   });
 }
 
+type Profile = Array<{ z: number; radius: number }>;
+
+type SimulationResult = Record<string, unknown> & {
+  impedance: Record<string, unknown> & { data: unknown };
+  frequency_response: Record<string, unknown> & { frequencies_hz: unknown; spl_db: unknown };
+  directivity: Record<string, unknown> & {
+    samples: Array<Record<string, unknown> & { directivity: unknown }>;
+  };
+};
+
+function simulationOutputPath(profilePath: string): string {
+  return path.join(
+    ARTIFACTS_DIR,
+    `sim_${path.basename(profilePath).replace(".json", "")}_${Date.now()}.json`
+  );
+}
+
+// Drop the per-frequency and per-angle arrays, keeping the scalar summaries
+function summarizeSimulation(result: SimulationResult) {
+  const { data: _data, ...impedance } = result.impedance;
+  const { frequencies_hz: _freqs, spl_db: _spl, ...frequencyResponse } = result.frequency_response;
+  return {
+    ...result,
+    impedance,
+    frequency_response: frequencyResponse,
+    directivity: {
+      ...result.directivity,
+      samples: result.directivity.samples.map(({ directivity: _pattern, ...sample }) => sample),
+    },
+  };
+}
+
+// Parsed profiles in least-recently-used order, revalidated against the
+// file's mtime and size so a regenerated profile is never served stale
+const PROFILE_CACHE_MAX = 32;
+const profileCache = new Map<string, { mtimeMs: number; size: number; profile: Profile }>();
+
+async function readProfile(profilePath: string): Promise<Profile> {
+  const stat = await fs.stat(profilePath);
+  const cached = profileCache.get(profilePath);
+  profileCache.delete(profilePath);
+
+  if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) {
+    profileCache.set(profilePath, cached);
+    return cached.profile;
+  }
+
+  const profile = JSON.parse(await fs.readFile(profilePath, "utf-8")) as Profile;
+  profileCache.set(profilePath, { mtimeMs: stat.mtimeMs, size: stat.size, profile });
+  if (profileCache.size > PROFILE_CACHE_MAX) {
+    const oldest = profileCache.keys().next().value;
+    if (oldest !== undefined) profileCache.delete(oldest);
+  }
+  return profile;
+}
+
+// Concurrent tool calls on the same profile share a single read and parse
+const pendingProfileLoads = new Map<string, Promise<Profile>>();
+
+function loadProfile(profilePath: string): Promise<Profile> {
+  let pending = pendingProfileLoads.get(profilePath);
+  if (!pending) {
+    pending = readProfile(profilePath)
+      .finally(() => pendingProfileLoads.delete(profilePath));
+    pendingProfileLoads.set(profilePath, pending);
+  }
+  return pending;
+}
+
 // Inline acoustic calculations for when Python is unavailable
 function computeImpedanceInline(
-  profile: Array<{ z: number; radius: number }>,
+  profile: Profile,
   frequencies: number[]
 ): {
   frequencies_hz: number[];
@@ -81,6 +159,16 @@ function computeImpedanceInline(
   const mouthRadius = profile[profile.length - 1].radius / 1000; // m
   const throatRadius = profile[0].radius / 1000; // m
   const throatArea = Math.PI * throatRadius ** 2;
+  const rhoCMouth = RHO_AIR * C_AIR * Math.PI * mouthRadius ** 2;
+  const rhoCThroat = RHO_AIR * C_AIR * throatArea;
+
+  // Simplified horn transformation
+  const expansionRatio = (mouthRadius / throatRadius) ** 2;
+  const length = profile[profile.length - 1].z / 1000; // m
+  const flareConstant = Math.log(expansionRatio) / length;
+
+  // Horn cutoff frequency
+  const fc = C_AIR * flareConstant / (2 * Math.PI);
 
   for (const freq of frequencies) {
     const omega = 2 * Math.PI * freq;
@@ -90,37 +178,30 @@ function computeImpedanceInline(
     // Radiation impedance at mouth
     let zRadReal: number, zRadImag: number;
     if (ka < 2) {
-      zRadReal = RHO_AIR * C_AIR * Math.PI * mouthRadius ** 2 * (ka ** 2) / 2;
-      zRadImag = RHO_AIR * C_AIR * Math.PI * mouthRadius ** 2 * (8 * ka) / (3 * Math.PI);
+      zRadReal = rhoCMouth * (ka ** 2) / 2;
+      zRadImag = rhoCMouth * (8 * ka) / (3 * Math.PI);
     } else {
-      zRadReal = RHO_AIR * C_AIR * Math.PI * mouthRadius ** 2;
+      zRadReal = rhoCMouth;
       zRadImag = 0;
     }
 
-    // Simplified horn transformation
-    const expansionRatio = (mouthRadius / throatRadius) ** 2;
-    const length = profile[profile.length - 1].z / 1000; // m
-    const flareConstant = Math.log(expansionRatio) / length;
-
-    // Horn cutoff frequency
-    const fc = C_AIR * flareConstant / (2 * Math.PI);
-
     // Impedance transformation
+    const fcRatio = fc / freq;
     let zThroatReal: number, zThroatImag: number;
     if (freq > fc) {
       // Above cutoff: good impedance match
-      const transmission = Math.sqrt(1 - (fc / freq) ** 2);
-      zThroatReal = RHO_AIR * C_AIR * throatArea * transmission;
-      zThroatImag = RHO_AIR * C_AIR * throatArea * (fc / freq) * 0.5;
+      const transmission = Math.sqrt(1 - fcRatio ** 2);
+      zThroatReal = rhoCThroat * transmission;
+      zThroatImag = rhoCThroat * fcRatio * 0.5;
     } else {
       // Below cutoff: reactive impedance
-      const evanescent = Math.sqrt((fc / freq) ** 2 - 1);
-      zThroatReal = RHO_AIR * C_AIR * throatArea * 0.1;
-      zThroatImag = RHO_AIR * C_AIR * throatArea * evanescent;
+      const evanescent = Math.sqrt(fcRatio ** 2 - 1);
+      zThroatReal = rhoCThroat * 0.1;
+      zThroatImag = rhoCThroat * evanescent;
     }
 
     const magnitude = Math.sqrt(zThroatReal ** 2 + zThroatImag ** 2);
-    const zNormalized = magnitude / (RHO_AIR * C_AIR * throatArea);
+    const zNormalized = magnitude / rhoCThroat;
     const reflection = Math.abs((zNormalized - 1) / (zNormalized + 1));
 
     result.frequencies_hz.push(freq);
@@ -136,8 +217,9 @@ function computeImpedanceInline(
 // Generate logarithmic frequency array
 function generateFrequencies(fMin: number, fMax: number, points: number): number[] {
   const frequencies: number[] = [];
+  const logStep = Math.log(fMax / fMin) / (points - 1);
   for (let i = 0; i < points; i++) {
-    const f = fMin * Math.pow(fMax / fMin, i / (points - 1));
+    const f = fMin * Math.exp(i * logStep);
     frequencies.push(Math.round(f * 10) / 10);
   }
   return frequencies;
@@ -149,6 +231,8 @@ const BEMParams = z.object({
   freq_min_hz: z.number().positive().default(500),
   freq_max_hz: z.number().positive().default(20000),
   freq_points: z.number().min(10).max(500).default(100),
+  include_curves: z.boolean().default(true)
+    .describe("Include per-frequency and per-angle arrays in the response; the saved result always has them"),
 });
 
 const ImpedanceParams = z.object({
@@ -173,12 +257,14 @@ server.tool(
   "run_simulation",
   `Run complete acoustic simulation on a horn geometry. Uses Transfer Matrix Method
 for impedance calculation and piston-in-baffle model for directivity. Returns
-impedance curves, frequency response, directivity patterns, and overall acoustic score.`,
+impedance curves, frequency response, directivity patterns, and overall acoustic score.
+Set include_curves to false to return only summary metrics and the path of the
+saved full result.`,
   BEMParams,
   async (params) => {
     await ensureArtifactsDir();
 
-    const { profile_path, freq_min_hz, freq_max_hz, freq_points } = params;
+    const { profile_path, freq_min_hz, freq_max_hz, freq_points, include_curves } = params;
 
     try {
       // Try Python simulation first
@@ -187,18 +273,15 @@ impedance curves, frequency response, directivity patterns, and overall acoustic
         "--freq-min", freq_min_hz.toString(),
         "--freq-max", freq_max_hz.toString(),
         "--freq-points", freq_points.toString(),
-      ]);
+      ]) as SimulationResult;
 
       // Save results
-      const outputPath = path.join(
-        ARTIFACTS_DIR,
-        `sim_${path.basename(profile_path).replace(".json", "")}_${Date.now()}.json`
-      );
+      const outputPath = simulationOutputPath(profile_path);
       await fs.writeFile(outputPath, JSON.stringify(result, null, 2));
 
       return {
         content: [{ type: "text", text: JSON.stringify({
-          ...result,
+          ...(include_curves ? result : summarizeSimulation(result)),
           output_path: outputPath,
         }, null, 2) }],
       };
@@ -207,8 +290,7 @@ impedance curves, frequency response, directivity patterns, and overall acoustic
       console.error("Python simulation failed, using inline fallback:", pyError);
 
       try {
-        const profileData = await fs.readFile(profile_path, "utf-8");
-        const profile = JSON.parse(profileData);
+        const profile = await loadProfile(profile_path);
         const frequencies = generateFrequencies(freq_min_hz, freq_max_hz, freq_points);
 
         const impedance = computeImpedanceInline(profile, frequencies);
@@ -243,8 +325,17 @@ impedance curves, frequency response, directivity patterns, and overall acoustic
           },
         };
 
+        // Save the full result so dropping the curves from the response loses nothing
+        const outputPath = simulationOutputPath(profile_path);
+        await fs.writeFile(outputPath, JSON.stringify(result, null, 2));
+
+        const { data: _data, ...impedanceSummary } = result.impedance;
         return {
-          content: [{ type: "text", text: JSON.stringify(result, null, 2) }],
+          content: [{ type: "text", text: JSON.stringify({
+            ...result,
+            impedance: include_curves ? result.impedance : impedanceSummary,
+            output_path: outputPath,
+          }, null, 2) }],
         };
       } catch (inlineError) {
         return {
@@ -269,8 +360,7 @@ understanding driver loading characteristics.`,
     const { profile_path } = params;
 
     try {
-      const profileData = await fs.readFile(profile_path, "utf-8");
-      const profile = JSON.parse(profileData);
+      const profile = await loadProfile(profile_path);
       const frequencies = generateFrequencies(500, 20000, 100);
 
       const impedance = computeImpedanceInline(profile, frequencies);
@@ -354,15 +444,17 @@ and directivity index.`,
     const { profile_path, frequency_hz } = params;
 
     try {
-      const profileData = await fs.readFile(profile_path, "utf-8");
-      const profile = JSON.parse(profileData);
+      const profile = await loadProfile(profile_path);
 
       const mouthRadius = profile[profile.length - 1].radius / 1000; // m
       const k = 2 * Math.PI * frequency_hz / C_AIR;
       const ka = k * mouthRadius;
 
-      // Calculate directivity pattern
-      const polarData: Array<{ angle_deg: number; relative_spl_db: number }> = [];
+      // Calculate directivity pattern as parallel arrays
+      const polarData: { angle_deg: number[]; relative_spl_db: number[] } = {
+        angle_deg: [],
+        relative_spl_db: [],
+      };
 
       for (let angle = 0; angle <= 180; angle += 5) {
         const angleRad = angle * Math.PI / 180;
@@ -384,22 +476,20 @@ and directivity index.`,
         }
 
         const spl = 20 * Math.log10(Math.max(Math.abs(d), 1e-10));
-        polarData.push({
-          angle_deg: angle,
-          relative_spl_db: Math.round(spl * 10) / 10,
-        });
+        polarData.angle_deg.push(angle);
+        polarData.relative_spl_db.push(Math.round(spl * 10) / 10);
       }
 
       // Find coverage angles
-      const find6dB = polarData.find(p => p.relative_spl_db < -6);
-      const find10dB = polarData.find(p => p.relative_spl_db < -10);
+      const find6dB = polarData.relative_spl_db.findIndex(spl => spl < -6);
+      const find10dB = polarData.relative_spl_db.findIndex(spl => spl < -10);
 
       // Compute directivity index
       let solidAngle = 0;
-      for (let i = 0; i < polarData.length - 1; i++) {
-        const d = 10 ** (polarData[i].relative_spl_db / 20);
+      for (let i = 0; i < polarData.angle_deg.length - 1; i++) {
+        const d = 10 ** (polarData.relative_spl_db[i] / 20);
         const dTheta = 5 * Math.PI / 180;
-        const theta = polarData[i].angle_deg * Math.PI / 180;
+        const theta = polarData.angle_deg[i] * Math.PI / 180;
         solidAngle += d * d * Math.sin(theta) * dTheta;
       }
       const di = solidAngle > 0 ? 10 * Math.log10(2 / solidAngle) : 0;
@@ -409,8 +499,8 @@ and directivity index.`,
         ka,
         mouth_diameter_mm: mouthRadius * 2000,
         coverage_angles: {
-          horizontal_6db_deg: find6dB ? find6dB.angle_deg * 2 : 180,
-          horizontal_10db_deg: find10dB ? find10dB.angle_deg * 2 : 180,
+          horizontal_6db_deg: find6dB >= 0 ? polarData.angle_deg[find6dB] * 2 : 180,
+          horizontal_10db_deg: find10dB >= 0 ? polarData.angle_deg[find10dB] * 2 : 180,
         },
         directivity_index_db: Math.round(di * 10) / 10,
         beamwidth_interpretation: ka < 1 ? "Omnidirectional (ka < 1)" :
@@ -447,8 +537,7 @@ and identifies the useful passband where response is within ±3dB.`,
     const { profile_path, freq_min_hz, freq_max_hz } = params;
 
     try {
-      const profileData = await fs.readFile(profile_path, "utf-8");
-      const profile = JSON.parse(profileData);
+      const profile = await loadProfile(profile_path);
       const frequencies = generateFrequencies(freq_min_hz, freq_max_hz, 100);
 
       const impedance = computeImpedanceInline(profile, frequencies);
@@ -548,8 +637,7 @@ each and ranks by overall acoustic score.`,
     const results = await Promise.all(
       profile_paths.map(async (profilePath) => {
         try {
-          const profileData = await fs.readFile(profilePath, "utf-8");
-          const profile = JSON.parse(profileData);
+          const profile = await loadProfile(profilePath);
           const frequencies = generateFrequencies(500, 20000, 50);
 
           const impedance = computeImpedanceInline(profile, frequencies);
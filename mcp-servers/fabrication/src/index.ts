@@ -79,6 +79,22 @@ const MATERIALS = {
   },
 };
 
+type MaterialKey = keyof typeof MATERIALS;
+
+// Resolve a material argument with a single own-key lookup
+function getMaterial(name: unknown) {
+  if (typeof name !== "string" || !Object.hasOwn(MATERIALS, name)) {
+    throw new Error(`Unknown material: ${String(name)}`);
+  }
+  return MATERIALS[name as MaterialKey];
+}
+
+// Schema fragment shared by every tool that takes a material
+const MATERIAL_PROPERTY = {
+  type: "string",
+  enum: Object.keys(MATERIALS),
+};
+
 // Tool definitions
 const tools: Tool[] = [
   {
@@ -94,8 +110,7 @@ status and specific issues with locations.`,
           description: "Path to STL/3MF geometry file",
         },
         material: {
-          type: "string",
-          enum: ["AlSi10Mg", "Ti6Al4V", "316L", "IN718"],
+          ...MATERIAL_PROPERTY,
           description: "Target material for constraint checking",
         },
         critical_angle: {
@@ -177,10 +192,7 @@ systems and in-situ monitoring configuration.`,
           type: "string",
           description: "Path to geometry with supports",
         },
-        material: {
-          type: "string",
-          enum: ["AlSi10Mg", "Ti6Al4V", "316L", "IN718"],
-        },
+        material: MATERIAL_PROPERTY,
         layer_thickness: {
           type: "number",
           default: 30,
@@ -217,10 +229,7 @@ and compensation geometry if needed.`,
           type: "string",
           description: "Path to build geometry",
         },
-        material: {
-          type: "string",
-          enum: ["AlSi10Mg", "Ti6Al4V", "316L", "IN718"],
-        },
+        material: MATERIAL_PROPERTY,
         platform_temp: {
           type: "number",
           default: 200,
@@ -294,10 +303,7 @@ and quality assurance. Provides detailed breakdown and volume discount projectio
           type: "string",
           description: "Path to build-ready geometry",
         },
-        material: {
-          type: "string",
-          enum: ["AlSi10Mg", "Ti6Al4V", "316L", "IN718"],
-        },
+        material: MATERIAL_PROPERTY,
         quantity: {
           type: "number",
           default: 1,
@@ -338,10 +344,10 @@ const server = new Server(
   }
 );
 
-// Handle tool listing
-server.setRequestHandler(ListToolsRequestSchema, async () => ({
-  tools,
-}));
+// Handle tool listing (definitions are static, so the response is built once)
+const listToolsResult = { tools };
+
+server.setRequestHandler(ListToolsRequestSchema, async () => listToolsResult);
 
 // Handle tool execution
 server.setRequestHandler(CallToolRequestSchema, async (request) => {
@@ -349,7 +355,7 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
 
   switch (name) {
     case "analyze_printability": {
-      const material = MATERIALS[args.material as keyof typeof MATERIALS];
+      const material = getMaterial(args.material);
       const criticalAngle = (args.critical_angle as number) || 45;
 
       // Simulated analysis results
@@ -518,7 +524,7 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
     }
 
     case "prepare_build": {
-      const material = MATERIALS[args.material as keyof typeof MATERIALS];
+      const material = getMaterial(args.material);
       const layerThickness = (args.layer_thickness as number) || 30;
       const laserCount = (args.laser_count as number) || 4;
 
@@ -571,7 +577,7 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
     }
 
     case "simulate_thermal": {
-      const material = MATERIALS[args.material as keyof typeof MATERIALS];
+      const material = getMaterial(args.material);
       const platformTemp = (args.platform_temp as number) || 200;
 
       const result = {
@@ -696,7 +702,7 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
     }
 
     case "estimate_cost": {
-      const material = MATERIALS[args.material as keyof typeof MATERIALS];
+      const material = getMaterial(args.material);
       const quantity = (args.quantity as number) || 1;
       const machineRate = (args.machine_rate as number) || 120;
       const surfaceFinish = (args.surface_finish as string) || "electropolish";
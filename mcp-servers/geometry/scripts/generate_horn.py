@@ -15,9 +15,12 @@ Or as module:
 import sys
 import json
 import math
+import hashlib
 import argparse
 from pathlib import Path
 
+import numpy as np
+
 # FreeCAD imports (available when run via freecadcmd)
 try:
     import FreeCAD
@@ -28,97 +31,120 @@ except ImportError:
     FREECAD_AVAILABLE = False
     print("Warning: FreeCAD not available, running in analysis-only mode", file=sys.stderr)
 
+# orjson is optional; it is a faster drop-in for the JSON written here
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def encode_json(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
 
-def hilbert_3d(order: int, size: float = 1.0) -> list:
+def hilbert_3d(order: int, size: float = 1.0) -> np.ndarray:
     """
     Generate 3D Hilbert curve points.
 
     The 3D Hilbert curve is a space-filling curve that visits every point
     in a 3D grid while maintaining locality (nearby points on the curve
     are nearby in space).
-    """
-    def hilbert_d2xy(n, d):
-        """Convert Hilbert index to 2D coordinates."""
-        x = y = 0
-        s = 1
-        while s < n:
-            rx = 1 & (d // 2)
-            ry = 1 & (d ^ rx)
-            if ry == 0:
-                if rx == 1:
-                    x = s - 1 - x
-                    y = s - 1 - y
-                x, y = y, x
-            x += s * rx
-            y += s * ry
-            d //= 4
-            s *= 2
-        return x, y
-
-    n = 2 ** order
-    points = []
-
-    # Generate 3D curve by stacking 2D Hilbert curves with z-variation
-    for z_level in range(n):
-        for d in range(n * n):
-            x, y = hilbert_d2xy(n, d)
-            # Normalize to [0, 1] range
-            px = x / (n - 1) if n > 1 else 0.5
-            py = y / (n - 1) if n > 1 else 0.5
-            pz = z_level / (n - 1) if n > 1 else 0.5
-            points.append((px * size, py * size, pz * size))
 
-    return points
+    Uses Skilling's transpose-to-axes transform (AIP Conf. Proc. 707, 2004)
+    applied to every curve index at once, so the cost is `order` passes of
+    array operations rather than one Python iteration per point.
 
-
-def peano_3d(iterations: int, size: float = 1.0) -> list:
+    Returns an (8**order, 3) array of points scaled to [0, size].
+    """
+    n = 2 ** order
+    h = np.arange(n ** 3, dtype=np.uint64)
+
+    # De-interleave the index into its transposed form: bit b of axis i is
+    # bit (3*b + 2 - i) of the Hilbert index.
+    axes = [np.zeros_like(h) for _ in range(3)]
+    for b in range(order):
+        for i in range(3):
+            bit = (h >> np.uint64(3 * b + 2 - i)) & np.uint64(1)
+            axes[i] |= bit << np.uint64(b)
+
+    # Gray decode
+    t = axes[2] >> np.uint64(1)
+    for i in range(2, 0, -1):
+        axes[i] ^= axes[i - 1]
+    axes[0] ^= t
+
+    # Undo excess work: per bit, invert or exchange low bits against axis 0
+    q = 2
+    while q < n:
+        p = np.uint64(q - 1)
+        for i in range(2, -1, -1):
+            invert = (axes[i] & np.uint64(q)) != 0
+            axes[0] = np.where(invert, axes[0] ^ p, axes[0])
+            t = np.where(invert, np.uint64(0), (axes[0] ^ axes[i]) & p)
+            axes[0] ^= t
+            axes[i] ^= t
+        q <<= 1
+
+    coords = np.stack(axes, axis=1).astype(np.int32)
+
+    # Normalize to [0, 1] range
+    if n > 1:
+        return coords * (size / (n - 1))
+    return np.full(coords.shape, 0.5 * size)
+
+
+# 9 sub-squares arrangement for the Peano curve: (tx, ty, flip_x, flip_y)
+PEANO_TRANSFORMS = np.array([
+    (0, 0, False, False),
+    (0, 1, False, True),
+    (0, 2, False, False),
+    (1, 2, True, False),
+    (1, 1, True, True),
+    (1, 0, True, False),
+    (2, 0, False, False),
+    (2, 1, False, True),
+    (2, 2, False, False),
+])
+
+
+def peano_3d(iterations: int, size: float = 1.0) -> np.ndarray:
     """
     Generate 3D Peano curve points.
 
     Peano curves have higher fractal dimension than Hilbert curves,
     creating denser space-filling patterns.
+
+    The 2D curve is built iteratively: each pass maps the previous curve
+    into all nine sub-squares with one broadcast operation, so there is
+    no recursion and no per-point Python work.
+
+    Returns an (27**iterations, 3) array of points scaled to [0, size].
     """
-    def peano_2d(n):
-        """Generate 2D Peano curve."""
-        if n == 0:
-            return [(0, 0)]
-
-        prev = peano_2d(n - 1)
-        scale = 1 / 3
-        result = []
-
-        # 9 sub-squares arrangement for Peano curve
-        transforms = [
-            (0, 0, False, False),
-            (0, 1, False, True),
-            (0, 2, False, False),
-            (1, 2, True, False),
-            (1, 1, True, True),
-            (1, 0, True, False),
-            (2, 0, False, False),
-            (2, 1, False, True),
-            (2, 2, False, False),
-        ]
-
-        for tx, ty, flip_x, flip_y in transforms:
-            for px, py in (reversed(prev) if flip_x else prev):
-                x = (tx + (1 - px if flip_x else px)) * scale
-                y = (ty + (1 - py if flip_y else py)) * scale
-                result.append((x, y))
-
-        return result
-
-    points_2d = peano_2d(iterations)
+    tx, ty = PEANO_TRANSFORMS[:, 0, None], PEANO_TRANSFORMS[:, 1, None]
+    flip_x = PEANO_TRANSFORMS[:, 2, None].astype(bool)
+    flip_y = PEANO_TRANSFORMS[:, 3, None].astype(bool)
+
+    points_2d = np.zeros((1, 2))
+    for _ in range(iterations):
+        # Flipped sub-squares traverse the previous curve in reverse
+        src = np.where(flip_x[:, :, None], points_2d[::-1], points_2d)
+        x = tx + np.where(flip_x, 1 - src[:, :, 0], src[:, :, 0])
+        y = ty + np.where(flip_y, 1 - src[:, :, 1], src[:, :, 1])
+        points_2d = np.stack((x, y), axis=-1).reshape(-1, 2) / 3
+
     n = 3 ** iterations
-    points = []
 
     # Extend to 3D
-    for z_level in range(n):
-        for px, py in points_2d:
-            pz = z_level / (n - 1) if n > 1 else 0.5
-            points.append((px * size, py * size, pz * size))
+    pz = np.arange(n) / (n - 1) if n > 1 else np.full(1, 0.5)
+    points = np.empty((n * len(points_2d), 3))
+    points[:, :2] = np.tile(points_2d, (n, 1))
+    points[:, 2] = np.repeat(pz, len(points_2d))
 
-    return points
+    return points * size
 
 
 def mandelbrot_boundary_sample(c_real: float, c_imag: float,
@@ -130,35 +156,47 @@ def mandelbrot_boundary_sample(c_real: float, c_imag: float,
     Returns points along the boundary that can be used to modulate
     horn expansion profile with fractal detail.
     """
-    def escape_time(cr, ci, max_iter):
-        zr, zi = 0, 0
-        for i in range(max_iter):
-            zr_new = zr * zr - zi * zi + cr
-            zi_new = 2 * zr * zi + ci
-            zr, zi = zr_new, zi_new
-            if zr * zr + zi * zi > 4:
-                return i
-        return max_iter
-
-    boundary_points = []
-
     # Sample in a small region around c
     radius = 0.1
-    for i in range(num_points):
-        angle = 2 * math.pi * i / num_points
-        sample_r = c_real + radius * math.cos(angle)
-        sample_i = c_imag + radius * math.sin(angle)
-
-        escape = escape_time(sample_r, sample_i, max_iter)
-        normalized_escape = escape / max_iter
-
-        boundary_points.append({
-            'angle': angle,
-            'escape_ratio': normalized_escape,
-            'in_set': escape == max_iter
-        })
+    angles = 2 * np.pi * np.arange(num_points) / num_points
+    cr = c_real + radius * np.cos(angles)
+    ci = c_imag + radius * np.sin(angles)
+
+    # Iterate all samples together, dropping each one once it escapes
+    escape = np.full(num_points, max_iter)
+    active = np.arange(num_points)
+    zr = np.zeros(num_points)
+    zi = np.zeros(num_points)
+    for i in range(max_iter):
+        zr, zi = zr * zr - zi * zi + cr, 2 * zr * zi + ci
+        escaped = zr * zr + zi * zi > 4
+        escape[active[escaped]] = i
+        running = ~escaped
+        active, zr, zi, cr, ci = active[running], zr[running], zi[running], cr[running], ci[running]
+        if not active.size:
+            break
+
+    return [
+        {'angle': angle, 'escape_ratio': e / max_iter, 'in_set': e == max_iter}
+        for angle, e in zip(angles.tolist(), escape.tolist())
+    ]
+
+
+def mandelbrot_orbit(c_real: float, c_imag: float, max_iter: int) -> list:
+    """
+    Real parts of z <- z² + c from z = 0, one per step.
 
-    return boundary_points
+    Stops after the step on which |z| exceeds 2, so the list has at most
+    max_iter entries.
+    """
+    orbit = []
+    zr, zi = 0, 0
+    for _ in range(max_iter):
+        zr, zi = zr * zr - zi * zi + c_real, 2 * zr * zi + c_imag
+        orbit.append(zr)
+        if zr * zr + zi * zi > 4:
+            break
+    return orbit
 
 
 def generate_expansion_profile(throat_d: float, mouth_d: float, length: float,
@@ -171,6 +209,7 @@ def generate_expansion_profile(throat_d: float, mouth_d: float, length: float,
     expansion from throat to mouth.
     """
     profile = []
+    orbit = None
 
     for i in range(num_points + 1):
         t = i / num_points  # Normalized position [0, 1]
@@ -196,15 +235,12 @@ def generate_expansion_profile(throat_d: float, mouth_d: float, length: float,
             # Base tractrix-like expansion
             base_radius = (throat_d / 2) + ((mouth_d - throat_d) / 2) * math.pow(t, 1.2)
 
-            # Fractal modulation from Mandelbrot boundary
+            # Fractal modulation from Mandelbrot boundary: every point follows
+            # the same orbit of c, just for more steps further along the horn
             angle = t * 2 * math.pi
-            zr, zi = 0, 0
-            for _ in range(int(iterations * t) + 1):
-                zr_new = zr * zr - zi * zi + c_real
-                zi_new = 2 * zr * zi + c_imag
-                zr, zi = zr_new, zi_new
-                if zr * zr + zi * zi > 4:
-                    break
+            if orbit is None:
+                orbit = mandelbrot_orbit(c_real, c_imag, iterations + 1)
+            zr = orbit[min(int(iterations * t) + 1, len(orbit)) - 1]
 
             # Modulation amplitude decreases with position (less at mouth)
             mod_amplitude = 0.03 * (1 - t * 0.5)
@@ -237,24 +273,22 @@ def calculate_fractal_dimension(profile: list) -> float:
         return 1.0
 
     # Extract radius variation
-    radii = [p['radius'] for p in profile]
-    z_vals = [p['z'] for p in profile]
+    radii = np.array([p['radius'] for p in profile])
+    z_vals = np.array([p['z'] for p in profile])
 
     # Compute derivative (local slope changes indicate complexity)
-    derivatives = []
-    for i in range(1, len(radii)):
-        dr = radii[i] - radii[i-1]
-        dz = z_vals[i] - z_vals[i-1]
-        if dz > 0:
-            derivatives.append(abs(dr / dz))
-
-    if not derivatives:
+    dr = np.diff(radii)
+    dz = np.diff(z_vals)
+    rising = dz > 0
+    derivatives = np.abs(dr[rising] / dz[rising])
+
+    if not derivatives.size:
         return 1.0
 
     # Box counting approximation
     # Higher variation = higher fractal dimension
-    mean_deriv = sum(derivatives) / len(derivatives)
-    std_deriv = math.sqrt(sum((d - mean_deriv)**2 for d in derivatives) / len(derivatives))
+    mean_deriv = float(derivatives.mean())
+    std_deriv = float(derivatives.std())
 
     # Map to fractal dimension range [1.0, 2.0]
     # Coefficient of variation indicates complexity
@@ -304,92 +338,159 @@ def create_horn_solid(profile: list, angular_resolution: int = 72) -> 'Part.Shap
     return solid
 
 
-def create_horn_mesh(profile: list, angular_resolution: int = 72) -> list:
+def create_horn_mesh(profile: list, angular_resolution: int = 72) -> tuple:
     """
     Create mesh vertices and faces from profile (for non-FreeCAD export).
 
-    Returns (vertices, faces) tuple for STL generation.
+    Returns (vertices, faces) tuple for STL generation: an (N, 3) float
+    array of vertex coordinates and an (M, 3) int array of vertex indices.
     """
-    vertices = []
-    faces = []
-
     num_profile_points = len(profile)
-
-    # Generate vertices by revolving profile
-    for i, p in enumerate(profile):
-        for j in range(angular_resolution):
-            angle = 2 * math.pi * j / angular_resolution
-            x = p['radius'] * math.cos(angle)
-            y = p['radius'] * math.sin(angle)
-            z = p['z']
-            vertices.append((x, y, z))
-
-    # Generate faces (quads split into triangles)
-    for i in range(num_profile_points - 1):
-        for j in range(angular_resolution):
-            # Current ring indices
-            curr = i * angular_resolution + j
-            next_j = i * angular_resolution + (j + 1) % angular_resolution
-            # Next ring indices
-            curr_next = (i + 1) * angular_resolution + j
-            next_j_next = (i + 1) * angular_resolution + (j + 1) % angular_resolution
-
-            # Two triangles per quad
-            faces.append((curr, next_j, curr_next))
-            faces.append((next_j, next_j_next, curr_next))
+    ring_vertices = num_profile_points * angular_resolution
+
+    radii = np.array([p['radius'] for p in profile])
+    z_vals = np.array([p['z'] for p in profile])
+    angles = 2 * np.pi * np.arange(angular_resolution) / angular_resolution
+
+    # Generate vertices by revolving profile, plus one centre vertex per cap
+    vertices = np.empty((ring_vertices + 2, 3))
+    rings = vertices[:ring_vertices].reshape(num_profile_points, angular_resolution, 3)
+    rings[:, :, 0] = radii[:, None] * np.cos(angles)
+    rings[:, :, 1] = radii[:, None] * np.sin(angles)
+    rings[:, :, 2] = z_vals[:, None]
+    center_throat = ring_vertices
+    center_mouth = ring_vertices + 1
+    vertices[center_throat] = (0, 0, profile[0]['z'])
+    vertices[center_mouth] = (0, 0, profile[-1]['z'])
+
+    j = np.arange(angular_resolution)
+    next_j = (j + 1) % angular_resolution
+    num_side = (num_profile_points - 1) * angular_resolution * 2
+    faces = np.empty((num_side + 2 * angular_resolution, 3), dtype=np.int64)
+
+    # Generate faces (quads split into triangles, two per quad)
+    ring = np.arange(num_profile_points - 1)[:, None] * angular_resolution
+    curr = ring + j
+    next_j_curr = ring + next_j
+    curr_next = curr + angular_resolution
+    next_j_next = next_j_curr + angular_resolution
+    quads = faces[:num_side].reshape(num_profile_points - 1, angular_resolution, 2, 3)
+    quads[:, :, 0] = np.stack((curr, next_j_curr, curr_next), axis=-1)
+    quads[:, :, 1] = np.stack((next_j_curr, next_j_next, curr_next), axis=-1)
 
     # Cap the throat (first ring)
-    center_throat = len(vertices)
-    vertices.append((0, 0, profile[0]['z']))
-    for j in range(angular_resolution):
-        next_j = (j + 1) % angular_resolution
-        faces.append((center_throat, next_j, j))
+    throat_cap = faces[num_side:num_side + angular_resolution]
+    throat_cap[:, 0] = center_throat
+    throat_cap[:, 1] = next_j
+    throat_cap[:, 2] = j
 
     # Cap the mouth (last ring)
-    center_mouth = len(vertices)
-    vertices.append((0, 0, profile[-1]['z']))
     last_ring_start = (num_profile_points - 1) * angular_resolution
-    for j in range(angular_resolution):
-        curr = last_ring_start + j
-        next_j = last_ring_start + (j + 1) % angular_resolution
-        faces.append((center_mouth, curr, next_j))
+    mouth_cap = faces[num_side + angular_resolution:]
+    mouth_cap[:, 0] = center_mouth
+    mouth_cap[:, 1] = last_ring_start + j
+    mouth_cap[:, 2] = last_ring_start + next_j
 
     return vertices, faces
 
 
-def write_stl_ascii(vertices: list, faces: list, filepath: str, name: str = "horn"):
-    """Write ASCII STL file."""
-    def normal(v0, v1, v2):
-        """Calculate face normal."""
-        u = (v1[0] - v0[0], v1[1] - v0[1], v1[2] - v0[2])
-        v = (v2[0] - v0[0], v2[1] - v0[1], v2[2] - v0[2])
-        n = (
-            u[1] * v[2] - u[2] * v[1],
-            u[2] * v[0] - u[0] * v[2],
-            u[0] * v[1] - u[1] * v[0]
-        )
-        length = math.sqrt(n[0]**2 + n[1]**2 + n[2]**2)
-        if length > 0:
-            return (n[0]/length, n[1]/length, n[2]/length)
-        return (0, 0, 1)
-
-    with open(filepath, 'w') as f:
-        f.write(f"solid {name}\n")
-        for face in faces:
-            v0, v1, v2 = vertices[face[0]], vertices[face[1]], vertices[face[2]]
-            n = normal(v0, v1, v2)
-            f.write(f"  facet normal {n[0]:.6e} {n[1]:.6e} {n[2]:.6e}\n")
-            f.write("    outer loop\n")
-            f.write(f"      vertex {v0[0]:.6e} {v0[1]:.6e} {v0[2]:.6e}\n")
-            f.write(f"      vertex {v1[0]:.6e} {v1[1]:.6e} {v1[2]:.6e}\n")
-            f.write(f"      vertex {v2[0]:.6e} {v2[1]:.6e} {v2[2]:.6e}\n")
-            f.write("    endloop\n")
-            f.write("  endfacet\n")
-        f.write(f"endsolid {name}\n")
+STL_FACET = (
+    "  facet normal {:.6e} {:.6e} {:.6e}\n"
+    "    outer loop\n"
+    "      vertex {:.6e} {:.6e} {:.6e}\n"
+    "      vertex {:.6e} {:.6e} {:.6e}\n"
+    "      vertex {:.6e} {:.6e} {:.6e}\n"
+    "    endloop\n"
+    "  endfacet\n"
+)
+
+
+# Binary STL facet record: normal, three vertices, attribute byte count
+STL_BINARY_FACET = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attribute', '<u2'),
+])
+
+
+def facet_normals(tri: np.ndarray) -> np.ndarray:
+    """Unit normals of an (M, 3, 3) triangle array, (0, 0, 1) if degenerate."""
+    v0, v1, v2 = tri[:, 0], tri[:, 1], tri[:, 2]
+    n = np.cross(v1 - v0, v2 - v0)
+    length = np.sqrt(np.sum(n * n, axis=1))
+    degenerate = length == 0
+    n[degenerate] = (0, 0, 1)
+    length[degenerate] = 1
+    n /= length[:, None]
+    return n
+
+
+def write_stl_ascii(vertices: np.ndarray, faces: np.ndarray, filepath: str,
+                    name: str = "horn", facets_per_chunk: int = 4096) -> str:
+    """
+    Write ASCII STL file.
+
+    Facets are rendered in fixed-size chunks and streamed as bytes through
+    a 1 MiB write buffer, so memory stays bounded regardless of mesh size.
+    The SHA-256 of the file is computed in the same pass and returned as
+    a hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'wb', buffering=1 << 20) as f:
+        def emit(data: bytes):
+            digest.update(data)
+            f.write(data)
+
+        emit(f"solid {name}\n".encode())
+        for start in range(0, len(faces), facets_per_chunk):
+            tri = vertices[faces[start:start + facets_per_chunk]]
+            rows = np.concatenate((facet_normals(tri), tri.reshape(-1, 9)), axis=1)
+            emit("".join(STL_FACET.format(*row) for row in rows.tolist()).encode())
+        emit(f"endsolid {name}\n".encode())
+
+    return digest.hexdigest()
+
+
+def write_stl_binary(vertices: np.ndarray, faces: np.ndarray, filepath: str,
+                     name: str = "horn", facets_per_chunk: int = 16384) -> str:
+    """
+    Write binary STL file.
+
+    About a fifth the size of the ASCII form, and the same format FreeCAD
+    exports. Written in chunks with the SHA-256 computed in the same pass,
+    like write_stl_ascii.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'wb', buffering=1 << 20) as f:
+        def emit(data: bytes):
+            digest.update(data)
+            f.write(data)
+
+        # The header must not start with "solid", or readers take it for ASCII
+        emit(f"binary STL {name}".encode()[:80].ljust(80, b' '))
+        emit(np.uint32(len(faces)).astype('<u4').tobytes())
+        for start in range(0, len(faces), facets_per_chunk):
+            tri = vertices[faces[start:start + facets_per_chunk]]
+            records = np.zeros(len(tri), dtype=STL_BINARY_FACET)
+            records['normal'] = facet_normals(tri)
+            records['vertices'] = tri
+            emit(records.tobytes())
+
+    return digest.hexdigest()
+
+
+def file_sha256(filepath: str, chunk_size: int = 1 << 20) -> str:
+    """Compute the SHA-256 digest of a file, reading it in chunks."""
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
 
 
 def generate_horn(horn_type: str, throat_d: float, mouth_d: float, length: float,
-                  output_path: str, angular_resolution: int = 72, **kwargs) -> dict:
+                  output_path: str, angular_resolution: int = 72,
+                  stl_format: str = 'binary', **kwargs) -> dict:
     """
     Main horn generation function.
 
@@ -400,6 +501,7 @@ def generate_horn(horn_type: str, throat_d: float, mouth_d: float, length: float
         length: Horn length in mm
         output_path: Path for STL output
         angular_resolution: Number of segments around circumference
+        stl_format: 'binary' or 'ascii' for the non-FreeCAD STL export
         **kwargs: Additional parameters (order, iterations, c_real, c_imag)
 
     Returns:
@@ -414,41 +516,39 @@ def generate_horn(horn_type: str, throat_d: float, mouth_d: float, length: float
     # Calculate metrics
     fractal_dim = calculate_fractal_dimension(profile)
 
+    radii = np.array([p['radius'] for p in profile])
+    z_vals = np.array([p['z'] for p in profile])
+    r1, r2 = radii[:-1], radii[1:]
+    dz = np.diff(z_vals)
+    dr = np.diff(radii)
+
     # Calculate path length (arc length of profile curve)
-    path_length = 0
-    for i in range(1, len(profile)):
-        dz = profile[i]['z'] - profile[i-1]['z']
-        dr = profile[i]['radius'] - profile[i-1]['radius']
-        path_length += math.sqrt(dz**2 + dr**2)
+    slant = np.hypot(dz, dr)
+    path_length = float(slant.sum())
 
     # Calculate volume and surface area (approximation)
-    volume = 0
-    surface_area = 0
-    for i in range(1, len(profile)):
-        r1, r2 = profile[i-1]['radius'], profile[i]['radius']
-        dz = profile[i]['z'] - profile[i-1]['z']
-
-        # Volume of frustum
-        volume += (math.pi * dz / 3) * (r1**2 + r1*r2 + r2**2)
+    # Volume of frustum
+    volume = float(np.sum((np.pi * dz / 3) * (r1**2 + r1*r2 + r2**2)))
 
-        # Surface area of frustum (lateral)
-        slant = math.sqrt(dz**2 + (r2-r1)**2)
-        surface_area += math.pi * (r1 + r2) * slant
+    # Surface area of frustum (lateral)
+    surface_area = float(np.sum(np.pi * (r1 + r2) * slant))
 
     # Generate mesh and export
+    write_stl = write_stl_ascii if stl_format == 'ascii' else write_stl_binary
     if FREECAD_AVAILABLE:
         try:
             solid = create_horn_solid(profile, angular_resolution)
             mesh = Mesh.Mesh()
             mesh.addFacets(solid.tessellate(0.1)[1])
             mesh.write(output_path)
+            checksum = file_sha256(output_path)
         except Exception as e:
             print(f"FreeCAD export failed: {e}, using fallback", file=sys.stderr)
             vertices, faces = create_horn_mesh(profile, angular_resolution)
-            write_stl_ascii(vertices, faces, output_path, f"sfh_{horn_type}_horn")
+            checksum = write_stl(vertices, faces, output_path, f"sfh_{horn_type}_horn")
     else:
         vertices, faces = create_horn_mesh(profile, angular_resolution)
-        write_stl_ascii(vertices, faces, output_path, f"sfh_{horn_type}_horn")
+        checksum = write_stl(vertices, faces, output_path, f"sfh_{horn_type}_horn")
 
     # Build result metadata
     result = {
@@ -469,6 +569,7 @@ def generate_horn(horn_type: str, throat_d: float, mouth_d: float, length: float
         },
         'output': {
             'stl_path': output_path,
+            'checksum': f"sha256:{checksum}",
             'vertex_count': angular_resolution * 101 + 2,
             'face_count': angular_resolution * 100 * 2 + angular_resolution * 2,
         },
@@ -487,11 +588,14 @@ def main():
     parser.add_argument('--length', type=float, default=400, help='Horn length (mm)')
     parser.add_argument('--output', type=str, required=True, help='Output STL path')
     parser.add_argument('--resolution', type=int, default=72, help='Angular resolution')
+    parser.add_argument('--stl-format', choices=['binary', 'ascii'], default='binary',
+                        help='STL encoding when exporting without FreeCAD')
     parser.add_argument('--order', type=int, default=4, help='Hilbert curve order')
     parser.add_argument('--iterations', type=int, default=100, help='Iterations (Peano/Mandelbrot)')
     parser.add_argument('--c-real', type=float, default=-0.75, help='Mandelbrot c real component')
     parser.add_argument('--c-imag', type=float, default=0, help='Mandelbrot c imaginary component')
     parser.add_argument('--json', action='store_true', help='Output result as JSON')
+    parser.add_argument('--profile-output', type=str, help='Output path for expansion profile JSON')
 
     args = parser.parse_args()
 
@@ -502,17 +606,22 @@ def main():
         length=args.length,
         output_path=args.output,
         angular_resolution=args.resolution,
+        stl_format=args.stl_format,
         order=args.order,
         iterations=args.iterations,
         c_real=args.c_real,
         c_imag=args.c_imag
     )
 
-    # Remove profile from JSON output (too large)
+    # The profile is too large for the JSON summary; serialize it only when
+    # a profile file is requested
     result_output = {k: v for k, v in result.items() if k != 'profile'}
+    if args.profile_output:
+        with open(args.profile_output, 'wb') as f:
+            f.write(encode_json(result['profile']))
 
     if args.json:
-        print(json.dumps(result_output, indent=2))
+        sys.stdout.buffer.write(encode_json(result_output, indent=True) + b'\n')
     else:
         print(f"Generated {args.type} horn:")
         print(f"  Fractal dimension: {result['metrics']['fractal_dimension']}")
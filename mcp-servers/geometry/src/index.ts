@@ -12,6 +12,7 @@ import { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import { StdioServerTransport } from "@modelcontextprotocol/sdk/server/stdio.js";
 import { z } from "zod";
 import { spawn } from "child_process";
+import { randomBytes } from "crypto";
 import { promises as fs } from "fs";
 import * as path from "path";
 
@@ -19,27 +20,34 @@ import * as path from "path";
 const SCRIPTS_DIR = path.join(import.meta.dirname, "..", "scripts");
 const ARTIFACTS_DIR = path.join(import.meta.dirname, "..", "..", "..", "artifacts", "geometry");
 
+// Child stderr is only quoted in error messages, so keep just its tail
+const STDERR_TAIL_CHARS = 64 * 1024;
+
 // Ensure artifacts directory exists
 async function ensureArtifactsDir() {
   await fs.mkdir(ARTIFACTS_DIR, { recursive: true });
 }
 
+// Interpreters to try: freecadcmd first, fall back to python3
+const INTERPRETERS = ["freecadcmd", "python3", "python"];
+
+// Index of the first interpreter that started, so later calls skip re-probing
+let interpreterIndex = 0;
+
 // Execute Python script for horn generation
 async function runHornGenerator(args: string[]): Promise<object> {
   return new Promise((resolve, reject) => {
     const scriptPath = path.join(SCRIPTS_DIR, "generate_horn.py");
-
-    // Try freecadcmd first, fall back to python3
-    const tryCommands = ["freecadcmd", "python3", "python"];
-    let cmdIndex = 0;
+    let cmdIndex = interpreterIndex;
 
     function tryNextCommand() {
-      if (cmdIndex >= tryCommands.length) {
+      if (cmdIndex >= INTERPRETERS.length) {
         reject(new Error("No Python interpreter found (tried freecadcmd, python3, python)"));
         return;
       }
 
-      const cmd = tryCommands[cmdIndex];
+      const index = cmdIndex;
+      const cmd = INTERPRETERS[index];
       const fullArgs = cmd === "freecadcmd"
         ? [scriptPath, "--", ...args, "--json"]
         : [scriptPath, ...args, "--json"];
@@ -49,28 +57,44 @@ async function runHornGenerator(args: string[]): Promise<object> {
         env: { ...process.env, PYTHONIOENCODING: "utf-8" }
       });
 
-      let stdout = "";
+      // Collect raw chunks and decode once, so multi-byte characters split
+      // across chunks survive and large outputs are not re-concatenated per chunk
+      const stdoutChunks: Buffer[] = [];
       let stderr = "";
 
-      proc.stdout.on("data", (data) => { stdout += data.toString(); });
-      proc.stderr.on("data", (data) => { stderr += data.toString(); });
+      proc.stdout.on("data", (data: Buffer) => { stdoutChunks.push(data); });
+      proc.stderr.on("data", (data) => {
+        stderr += data.toString();
+        if (stderr.length > STDERR_TAIL_CHARS) stderr = stderr.slice(-STDERR_TAIL_CHARS);
+      });
+
+      // A missing command emits "error" and then "close" (with a negative
+      // code), so remember the failure and let "close" ignore it
+      let spawned = false;
+      let spawnFailed = false;
+
+      proc.on("spawn", () => {
+        spawned = true;
+        interpreterIndex = index;
+      });
 
       proc.on("error", () => {
-        cmdIndex++;
+        if (spawned) return;
+        spawnFailed = true;
+        cmdIndex = index + 1;
         tryNextCommand();
       });
 
       proc.on("close", (code) => {
+        if (spawnFailed) return;
+        const stdout = Buffer.concat(stdoutChunks).toString("utf-8");
+
         if (code === 0) {
           try {
             resolve(JSON.parse(stdout));
           } catch {
-            reject(new Error(`Failed to parse generator output: ${stdout}`));
+            reject(new Error(`Failed to parse generator output: ${stdout.slice(0, 500)}`));
           }
-        } else if (code === null) {
-          // Process didn't start, try next command
-          cmdIndex++;
-          tryNextCommand();
         } else {
           reject(new Error(`Generator failed (code ${code}): ${stderr}`));
         }
@@ -83,34 +107,32 @@ async function runHornGenerator(args: string[]): Promise<object> {
 
 // Generate unique ID for geometry
 function generateId(): string {
-  return `${Date.now().toString(36)}_${Math.random().toString(36).slice(2, 8)}`;
+  return `${Date.now().toString(36)}_${randomBytes(3).toString("hex")}`;
 }
 
 // Tool parameter schemas
-const HilbertParams = z.object({
-  order: z.number().min(1).max(6).default(4),
+const HornDimensionParams = {
   throat_diameter_mm: z.number().positive().default(25.4),
   mouth_diameter_mm: z.number().positive().default(300),
   length_mm: z.number().positive().default(400),
   angular_resolution: z.number().min(24).max(360).default(72),
+};
+
+const HilbertParams = z.object({
+  order: z.number().min(1).max(6).default(4),
+  ...HornDimensionParams,
 });
 
 const PeanoParams = z.object({
   iterations: z.number().min(1).max(5).default(3),
-  throat_diameter_mm: z.number().positive().default(25.4),
-  mouth_diameter_mm: z.number().positive().default(300),
-  length_mm: z.number().positive().default(400),
-  angular_resolution: z.number().min(24).max(360).default(72),
+  ...HornDimensionParams,
 });
 
 const MandelbrotParams = z.object({
   c_real: z.number().default(-0.75),
   c_imag: z.number().default(0),
   iterations: z.number().min(10).max(1000).default(100),
-  throat_diameter_mm: z.number().positive().default(25.4),
-  mouth_diameter_mm: z.number().positive().default(300),
-  length_mm: z.number().positive().default(400),
-  angular_resolution: z.number().min(24).max(360).default(72),
+  ...HornDimensionParams,
 });
 
 const AnalyzeParams = z.object({
@@ -139,6 +161,7 @@ values increase fractal complexity but also computation time.`,
 
     const id = generateId();
     const outputPath = path.join(ARTIFACTS_DIR, `hilbert_o${params.order}_${id}.stl`);
+    const profilePath = outputPath.replace(".stl", "_profile.json");
 
     try {
       const result = await runHornGenerator([
@@ -149,6 +172,7 @@ values increase fractal complexity but also computation time.`,
         "--order", params.order.toString(),
         "--resolution", params.angular_resolution.toString(),
         "--output", outputPath,
+        "--profile-output", profilePath,
       ]) as Record<string, unknown>;
 
       // Enhance result with ID and type info
@@ -159,18 +183,10 @@ values increase fractal complexity but also computation time.`,
         ...result,
         files: {
           mesh: outputPath,
-          profile: outputPath.replace(".stl", "_profile.json"),
+          profile: profilePath,
         },
       };
 
-      // Write profile data
-      if (result.profile) {
-        await fs.writeFile(
-          enhanced.files.profile,
-          JSON.stringify(result.profile, null, 2)
-        );
-      }
-
       return {
         content: [{ type: "text", text: JSON.stringify(enhanced, null, 2) }],
       };
@@ -198,6 +214,7 @@ optimal for maximum high-frequency detail and complex internal structure.`,
 
     const id = generateId();
     const outputPath = path.join(ARTIFACTS_DIR, `peano_i${params.iterations}_${id}.stl`);
+    const profilePath = outputPath.replace(".stl", "_profile.json");
 
     try {
       const result = await runHornGenerator([
@@ -208,6 +225,7 @@ optimal for maximum high-frequency detail and complex internal structure.`,
         "--iterations", params.iterations.toString(),
         "--resolution", params.angular_resolution.toString(),
         "--output", outputPath,
+        "--profile-output", profilePath,
       ]) as Record<string, unknown>;
 
       const enhanced = {
@@ -217,17 +235,10 @@ optimal for maximum high-frequency detail and complex internal structure.`,
         ...result,
         files: {
           mesh: outputPath,
-          profile: outputPath.replace(".stl", "_profile.json"),
+          profile: profilePath,
         },
       };
 
-      if (result.profile) {
-        await fs.writeFile(
-          enhanced.files.profile,
-          JSON.stringify(result.profile, null, 2)
-        );
-      }
-
       return {
         content: [{ type: "text", text: JSON.stringify(enhanced, null, 2) }],
       };
@@ -258,6 +269,7 @@ region of the Mandelbrot boundary to sample:
     const id = generateId();
     const cStr = `c${params.c_real.toFixed(2).replace("-", "n")}${params.c_imag >= 0 ? "p" : "n"}${Math.abs(params.c_imag).toFixed(2)}`;
     const outputPath = path.join(ARTIFACTS_DIR, `mandelbrot_${cStr}_${id}.stl`);
+    const profilePath = outputPath.replace(".stl", "_profile.json");
 
     try {
       const result = await runHornGenerator([
@@ -270,6 +282,7 @@ region of the Mandelbrot boundary to sample:
         "--c-imag", params.c_imag.toString(),
         "--resolution", params.angular_resolution.toString(),
         "--output", outputPath,
+        "--profile-output", profilePath,
       ]) as Record<string, unknown>;
 
       const enhanced = {
@@ -280,17 +293,10 @@ region of the Mandelbrot boundary to sample:
         ...result,
         files: {
           mesh: outputPath,
-          profile: outputPath.replace(".stl", "_profile.json"),
+          profile: profilePath,
         },
       };
 
-      if (result.profile) {
-        await fs.writeFile(
-          enhanced.files.profile,
-          JSON.stringify(result.profile, null, 2)
-        );
-      }
-
       return {
         content: [{ type: "text", text: JSON.stringify(enhanced, null, 2) }],
       };
@@ -63,6 +63,98 @@ const DashboardParams = z.object({
   interactive: z.boolean().default(true),
 });
 
+// Lookup tables shared by every call; results are serialized straight to JSON
+// and never mutated
+const RESOLUTIONS = {
+  preview: { width: 800, height: 600 },
+  standard: { width: 1920, height: 1080 },
+  high: { width: 2560, height: 1440 },
+  "4k": { width: 3840, height: 2160 },
+};
+
+const STYLE_CONFIGS = {
+  publication: {
+    font: "Times New Roman",
+    font_size: 10,
+    line_width: 1,
+    figure_width_mm: 85,
+    dpi: 300,
+  },
+  presentation: {
+    font: "Arial",
+    font_size: 18,
+    line_width: 2,
+    figure_width_mm: 254,
+    dpi: 150,
+  },
+  web: {
+    font: "Inter",
+    font_size: 14,
+    line_width: 1.5,
+    figure_width_mm: 200,
+    dpi: 96,
+  },
+};
+
+const DASHBOARD_LAYOUTS = {
+  geometry_comparison: {
+    columns: 3,
+    rows: 4,
+    panels: [
+      { type: "3d_render", span: [1, 1], sync_rotation: true },
+      { type: "3d_render", span: [1, 1], sync_rotation: true },
+      { type: "3d_render", span: [1, 1], sync_rotation: true },
+      { type: "fr_overlay", span: [3, 1] },
+      { type: "polar_comparison", span: [3, 1] },
+      { type: "metrics_table", span: [3, 1] },
+    ],
+  },
+  simulation_results: {
+    columns: 2,
+    rows: 3,
+    panels: [
+      { type: "impedance_plot", span: [1, 1] },
+      { type: "fr_plot", span: [1, 1] },
+      { type: "polar_balloon", span: [1, 1] },
+      { type: "waterfall", span: [1, 1] },
+      { type: "pressure_field", span: [2, 1] },
+    ],
+  },
+  verification_report: {
+    columns: 2,
+    rows: 4,
+    panels: [
+      { type: "measured_vs_simulated_fr", span: [2, 1] },
+      { type: "impedance_overlay", span: [1, 1] },
+      { type: "polar_overlay", span: [1, 1] },
+      { type: "deviation_heatmap", span: [1, 1] },
+      { type: "pass_fail_summary", span: [1, 1] },
+      { type: "defect_map", span: [2, 1] },
+    ],
+  },
+};
+
+const PLOT_ELEMENTS: Record<string, object> = {
+  frequency_response: {
+    x_axis: { label: "Frequency (Hz)", scale: "log", range: [20, 20000] },
+    y_axis: { label: "SPL (dB)", scale: "linear", range: [70, 120] },
+    grid: true,
+    legend: true,
+  },
+  impedance: {
+    subplots: 2,
+    subplot_1: { y_label: "|Z| (Ω)", scale: "linear" },
+    subplot_2: { y_label: "Phase (°)", scale: "linear", range: [-90, 90] },
+    shared_x: true,
+  },
+  polar: {
+    projection: "polar",
+    angular_range: [0, 360],
+    radial_range: [-30, 0],
+    grid_circles: [-6, -12, -18, -24],
+  },
+};
+
 const server = new McpServer({
   name: "sfh-visualization",
   version: "0.1.0",
@@ -75,15 +167,8 @@ server.tool(
   async (params) => {
     const { mesh_path, style, views, resolution, annotations, output_format } = params;
 
-    const resolutions = {
-      preview: { width: 800, height: 600 },
-      standard: { width: 1920, height: 1080 },
-      high: { width: 2560, height: 1440 },
-      "4k": { width: 3840, height: 2160 },
-    };
-
     const outputs: Record<string, string> = {};
-    const res = resolutions[resolution];
+    const res = RESOLUTIONS[resolution];
 
     for (const view of views) {
       const baseName = mesh_path.replace(/\.[^.]+$/, "");
@@ -126,31 +211,7 @@ server.tool(
   async (params) => {
     const { plot_type, data_path, style, output_format } = params;
 
-    const styleConfigs = {
-      publication: {
-        font: "Times New Roman",
-        font_size: 10,
-        line_width: 1,
-        figure_width_mm: 85,
-        dpi: 300,
-      },
-      presentation: {
-        font: "Arial",
-        font_size: 18,
-        line_width: 2,
-        figure_width_mm: 254,
-        dpi: 150,
-      },
-      web: {
-        font: "Inter",
-        font_size: 14,
-        line_width: 1.5,
-        figure_width_mm: 200,
-        dpi: 96,
-      },
-    };
-
-    const config = styleConfigs[style];
+    const config = STYLE_CONFIGS[style];
     const outputPath = data_path.replace(/\.[^.]+$/, `_${plot_type}.${output_format}`);
 
     const result = {
@@ -204,45 +265,7 @@ server.tool(
   async (params) => {
     const { dashboard_type, data_paths, interactive } = params;
 
-    const layouts = {
-      geometry_comparison: {
-        columns: 3,
-        rows: 4,
-        panels: [
-          { type: "3d_render", span: [1, 1], sync_rotation: true },
-          { type: "3d_render", span: [1, 1], sync_rotation: true },
-          { type: "3d_render", span: [1, 1], sync_rotation: true },
-          { type: "fr_overlay", span: [3, 1] },
-          { type: "polar_comparison", span: [3, 1] },
-          { type: "metrics_table", span: [3, 1] },
-        ],
-      },
-      simulation_results: {
-        columns: 2,
-        rows: 3,
-        panels: [
-          { type: "impedance_plot", span: [1, 1] },
-          { type: "fr_plot", span: [1, 1] },
-          { type: "polar_balloon", span: [1, 1] },
-          { type: "waterfall", span: [1, 1] },
-          { type: "pressure_field", span: [2, 1] },
-        ],
-      },
-      verification_report: {
-        columns: 2,
-        rows: 4,
-        panels: [
-          { type: "measured_vs_simulated_fr", span: [2, 1] },
-          { type: "impedance_overlay", span: [1, 1] },
-          { type: "polar_overlay", span: [1, 1] },
-          { type: "deviation_heatmap", span: [1, 1] },
-          { type: "pass_fail_summary", span: [1, 1] },
-          { type: "defect_map", span: [2, 1] },
-        ],
-      },
-    };
-
-    const layout = layouts[dashboard_type as keyof typeof layouts] || layouts.simulation_results;
+    const layout = DASHBOARD_LAYOUTS[dashboard_type as keyof typeof DASHBOARD_LAYOUTS] || DASHBOARD_LAYOUTS.simulation_results;
 
     const result = {
       dashboard_type,
@@ -263,27 +286,7 @@ server.tool(
 
 // Helper functions
 function getPlotElements(plotType: string) {
-  const elements: Record<string, object> = {
-    frequency_response: {
-      x_axis: { label: "Frequency (Hz)", scale: "log", range: [20, 20000] },
-      y_axis: { label: "SPL (dB)", scale: "linear", range: [70, 120] },
-      grid: true,
-      legend: true,
-    },
-    impedance: {
-      subplots: 2,
-      subplot_1: { y_label: "|Z| (Ω)", scale: "linear" },
-      subplot_2: { y_label: "Phase (°)", scale: "linear", range: [-90, 90] },
-      shared_x: true,
-    },
-    polar: {
-      projection: "polar",
-      angular_range: [0, 360],
-      radial_range: [-30, 0],
-      grid_circles: [-6, -12, -18, -24],
-    },
-  };
-  return elements[plotType] || {};
+  return PLOT_ELEMENTS[plotType] || {};
 }
 
 function generateKeyframes(animationType: string, totalFrames: number) {